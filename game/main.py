@@ -67,6 +67,7 @@ CAM_LERP = 0.12               # how quickly camera follows player (0–1, fracti
 # .dirname() F to give the path of a file;
 STATS_PATH = os.path.join(os.path.dirname(__file__), "..", "stats.json")
 LEVELS_DIR = os.path.join(os.path.dirname(__file__), "..", "levels")
+TELEMETRY_DIR = os.path.join(os.path.dirname(__file__), "..", "telemetry")
 
 # ------------------------------Helpers------------------------------
 
@@ -78,15 +79,23 @@ def clamp(v, lo, hi):
 def rect_from_tile(tx, ty):
     return pg.Rect(tx*TILE, ty*TILE, TILE, TILE)
 
-# detects which tiles could be overlapped depending on rect position
-# x0 is left pixel of rect floor-divided by tile size to get tile index; -1 expands search for safety
-# returns list of (x, y) pairs [tile coordinates] to be checked for collisions
-def tiles_overlapping(rect):
-    x0 = int(rect.left // TILE) - 1
-    y0 = int(rect.top // TILE) - 1
-    x1 = int(rect.right // TILE) + 1    
-    y1 = int(rect.bottom // TILE) + 1
-    return [(x, y) for x in range(x0, x1+1) for y in range(y0, y1+1)]
+# merges a set of (x, y) tiles into as few big rectangles as possible (greedy meshing)
+# each free tile grows right as far as it can, then down while the whole row below is free too
+# returns list of pixel rects [used for collisions instead of checking tile by tile]
+def merge_tiles(tiles):
+    free = set(tiles)
+    rects = []
+    for x, y in sorted(tiles, key=lambda t: (t[1], t[0])):
+        if (x, y) not in free: continue
+        x1 = x
+        while (x1+1, y) in free: x1 += 1
+        y1 = y
+        while all((i, y1+1) in free for i in range(x, x1+1)): y1 += 1
+        for j in range(y, y1+1):
+            for i in range(x, x1+1):
+                free.discard((i, j))
+        rects.append(pg.Rect(x*TILE, y*TILE, (x1-x+1)*TILE, (y1-y+1)*TILE))
+    return rects
 
 # gives a number between a and b depending on t in range from 0 to 1 [10 + (20 - 10) * 0,3 = 13 —> 30% of the way from 10 to 20]
 # used for smooth camera following 
@@ -151,6 +160,13 @@ class Level:
         self.spawn = (2*TILE, 2*TILE)
         self._parse()
 
+        # precomputed shapes for collisions (built once at load, not every frame)
+        self.solids = merge_tiles(self.walls)
+        self.spike_rects = merge_tiles(self.spikes)
+        # grabbable wall faces: thin 1px rects on the wall edge; "grab_left" = wall on player's left side
+        self.grab_left = self._grab_faces(1)
+        self.grab_right = self._grab_faces(-1)
+
     def _parse(self):
         for y, row in enumerate(self.lines):
             for x, ch in enumerate(row):
@@ -170,6 +186,26 @@ class Level:
             if (0, y) in self.walls: self.boundary.add((0, y))
             if (self.w-1, y) in self.walls: self.boundary.add((self.w-1, y))
 
+    # wall tile with open space on side "dx" (+1 right, -1 left); same boundary rule as the old per-tile grab check
+    def _grabbable(self, x, y, dx):
+        return ((x, y) in self.walls and (x+dx, y) not in self.walls
+                and ((x, y) not in self.boundary or not ALLOW_EDGE_GRAB))
+
+    # merges vertical runs of grabbable tiles in each column into one face rect
+    def _grab_faces(self, dx):
+        faces = []
+        for x in range(self.w):
+            y = 0
+            while y < self.h:
+                if not self._grabbable(x, y, dx):
+                    y += 1
+                    continue
+                y0 = y
+                while y < self.h and self._grabbable(x, y, dx): y += 1
+                edge = (x+1)*TILE - 1 if dx > 0 else x*TILE
+                faces.append(pg.Rect(edge, y0*TILE, 1, (y-y0)*TILE))
+        return faces
+
     @classmethod
     def from_file(cls, path):
         with open(path, "r", encoding="utf-8") as f:
@@ -222,20 +258,14 @@ class Player:
         self.dead = False
         self.win = False
 
+    # returns the grabbable wall faces (or None) the player touches on the left / right
     def touching_wall_side(self, level):
         r = self.rect
         # Expand a tiny bit left/right to detect adjacency
-        left_probe = r.move(-1, 0)
-        right_probe = r.move(1, 0)
-        touching_left = touching_right = None
-        for tx, ty in tiles_overlapping(left_probe):
-            if (tx, ty) in level.walls and left_probe.colliderect(rect_from_tile(tx,ty)):
-                touching_left = (tx, ty)
-                break
-        for tx, ty in tiles_overlapping(right_probe):
-            if (tx, ty) in level.walls and right_probe.colliderect(rect_from_tile(tx,ty)):
-                touching_right = (tx, ty)
-                break
+        i = r.move(-1, 0).collidelist(level.grab_left)
+        j = r.move(1, 0).collidelist(level.grab_right)
+        touching_left = level.grab_left[i] if i != -1 else None
+        touching_right = level.grab_right[j] if j != -1 else None
         return touching_left, touching_right
 
 
@@ -281,9 +311,10 @@ class Player:
 
 
         # ---- touching walls (for grab logic) ----
-        left_tile, right_tile = self.touching_wall_side(level)
-        can_grab_left  = (left_tile  is not None) and (left_tile  not in level.boundary or not ALLOW_EDGE_GRAB) and (left_tile  not in level.spikes)
-        can_grab_right = (right_tile is not None) and (right_tile not in level.boundary or not ALLOW_EDGE_GRAB) and (right_tile not in level.spikes)
+        # (boundary / ALLOW_EDGE_GRAB rules are already applied in Level.grab_left / grab_right)
+        left_face, right_face = self.touching_wall_side(level)
+        can_grab_left  = left_face is not None
+        can_grab_right = right_face is not None
 
         want_grab = grab_held and (can_grab_left or can_grab_right) and self.stamina > 0 and not self.on_ground
 
@@ -294,10 +325,10 @@ class Player:
             # stick to the wall
             if can_grab_left:
                 self.facing = -1
-                self.pos.x = rect_from_tile(*left_tile).right
+                self.pos.x = left_face.right
             elif can_grab_right:
                 self.facing = 1
-                self.pos.x = rect_from_tile(*right_tile).left - self.size.x
+                self.pos.x = right_face.left - self.size.x
 
             # climb using collision-safe movement
             if y_up:
@@ -369,32 +400,28 @@ class Player:
         r = self.rect
         if dy != 0: self.on_ground = False
 
-        # Walls
-        for tx, ty in tiles_overlapping(r):
-            if (tx, ty) in level.walls:
-                tile = rect_from_tile(tx, ty)
-                if r.colliderect(tile):
-                    if dx > 0:
-                        self.pos.x = tile.left - self.size.x
-                        self.vel.x = 0
-                    if dx < 0:
-                        self.pos.x = tile.right
-                        self.vel.x = 0
-                    if dy > 0:
-                        self.pos.y = tile.top - self.size.y
-                        self.vel.y = 0
-                        self.on_ground = True
-                        self.coyote = COYOTE_TIME
-                    if dy < 0:
-                        self.pos.y = tile.bottom
-                        self.vel.y = 0
+        # Walls (merged rects; ".collidelistall" returns indexes of every rect overlapping "r")
+        for i in r.collidelistall(level.solids):
+            solid = level.solids[i]
+            if dx > 0:
+                self.pos.x = solid.left - self.size.x
+                self.vel.x = 0
+            if dx < 0:
+                self.pos.x = solid.right
+                self.vel.x = 0
+            if dy > 0:
+                self.pos.y = solid.top - self.size.y
+                self.vel.y = 0
+                self.on_ground = True
+                self.coyote = COYOTE_TIME
+            if dy < 0:
+                self.pos.y = solid.bottom
+                self.vel.y = 0
 
         # Spikes kill
-        for tx, ty in tiles_overlapping(r):
-            if (tx, ty) in level.spikes:
-                if self.rect.colliderect(rect_from_tile(tx, ty)):
-                    self.dead = True
-                    return
+        if self.rect.collidelist(level.spike_rects) != -1:
+            self.dead = True
+            return
 
 # ------------------------------Drawing------------------------------
 
@@ -488,6 +515,12 @@ class Game:
         self.npc_message = ""  # for simple NPC dialog
         self.npc_timer = 0.0
 
+        # opt-in telemetry (see game/telemetry.py); None = off, nothing recorded
+        self.telemetry = None
+        if args.telemetry:
+            from .telemetry import TelemetryRecorder
+            self.telemetry = TelemetryRecorder(TELEMETRY_DIR)
+
     def start_level(self, idx):
         self.level_idx = idx
         self.level = Level.from_file(self.level_paths[idx])
@@ -496,6 +529,8 @@ class Game:
         self.level_start_time = time.time()
         self.level_time = 0
         self.cam.update(0,0)
+        if self.telemetry:
+            self.telemetry.begin(os.path.splitext(os.path.basename(self.level_paths[idx]))[0])
 
     def run(self):
         running = True
@@ -555,6 +590,8 @@ class Game:
             # Update states
             if self.state == "PLAYING":
                 self.player.update(dt, self.level, keys)
+                if self.telemetry:
+                    self.telemetry.record(time.time() - self.level_start_time, self.player)
                 if self.player.dead:
                     self.deaths += 1
                     self.player.kill_and_respawn(self.level)
@@ -601,6 +638,8 @@ class Game:
             pg.display.flip()
 
         save_stats(self.stats)
+        if self.telemetry:
+            self.telemetry.close()
         pg.quit()
 
     # ---- UI renderers ----
@@ -675,6 +714,7 @@ class Game:
 def run():
     parser = argparse.ArgumentParser(description="Celest-ish Homework (terminal launch)")
     parser.add_argument("--scale", type=int, default=3, help="window scale (pixels upscaled)")
+    parser.add_argument("--telemetry", action="store_true", help="record gameplay telemetry into 'telemetry/'")
     args = parser.parse_args()
     game = Game(args)
     game.run()
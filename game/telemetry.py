@@ -0,0 +1,258 @@
+# ------------------------------Imports------------------------------
+
+import os, sys, glob, time, struct, queue, threading, argparse
+from array import array
+
+# ------------------------------Basic Info------------------------------
+
+# Opt-in gameplay telemetry (python -m game --telemetry).
+# Recorder: every frame writes into preallocated columns (one "array" per field), no dicts / JSON in the game loop.
+# When a block of columns is full it is handed to a background thread which appends it to the session file.
+# Aggregator (python -m game.telemetry): scans many session files and builds per-tile death / traversal heatmaps.
+# "array" M with typed, compact lists ["f" = float32, "B" = unsigned byte] that can be dumped as raw bytes;
+# "struct" M to pack/unpack raw bytes [the chunk headers];
+# "threading" + "queue" to write files on another thread so the game loop never waits for the disk.
+
+# ------------------------------File format------------------------------
+
+# One append-only file per (session, level): telemetry/<level name>/<session id>.cbt
+# Every attempt at the level (start, ESC restart, replay) is a "run" inside that file, not a new file.
+# The file is a list of chunks appended one after another:
+#   header  : magic b"CBT1" + uint32 run id + uint32 frame count n
+#   columns : t, x, y, vx, vy as n little-endian float32 each, then flags as n uint8
+#   padding : zero bytes up to a multiple of 4, so every float column stays aligned when memory-mapped
+MAGIC = b"CBT1"
+HEADER = struct.Struct("<4sII")
+FLOAT_COLUMNS = ("t", "x", "y", "vx", "vy")
+FILE_EXT = ".cbt"
+CHUNK_FRAMES = 4096             # frames per preallocated block (~68 s at 60 FPS)
+BATCH_FILES = 1024              # session files binned together by the aggregator
+
+# state flags (bit mask in the "flags" column)
+FLAG_GROUND = 1
+FLAG_GRAB = 2
+FLAG_DASH = 4
+FLAG_DEATH = 8
+FLAG_WIN = 16
+
+def player_flags(player):
+    return ((FLAG_GROUND if player.on_ground else 0) | (FLAG_GRAB if player.grabbing else 0)
+            | (FLAG_DASH if player.dashing else 0) | (FLAG_DEATH if player.dead else 0)
+            | (FLAG_WIN if player.win else 0))
+
+def chunk_size(n):
+    size = HEADER.size + n * (4 * len(FLOAT_COLUMNS) + 1)
+    return size + (-size) % 4
+
+# ------------------------------Recorder------------------------------
+
+class _Block:
+    # one set of preallocated columns; reused after the writer thread has flushed it
+    def __init__(self, frames):
+        zeros = bytes(4 * frames)
+        self.cols = [array("f", zeros) for _ in FLOAT_COLUMNS]
+        self.flags = array("B", bytes(frames))
+
+class TelemetryRecorder:
+    def __init__(self, out_dir, chunk_frames=CHUNK_FRAMES):
+        self.out_dir = out_dir
+        self.chunk_frames = chunk_frames
+        self.session = f"{time.strftime('%Y%m%d-%H%M%S')}-{os.getpid()}"
+        self.path = None
+        self.n = 0
+        self.run = 0
+
+        self._free = queue.Queue()
+        self._jobs = queue.Queue()
+        self._use_block(_Block(chunk_frames))
+        self._thread = threading.Thread(target=self._writer, name="telemetry-writer", daemon=True)
+        self._thread.start()
+
+    def _use_block(self, block):
+        self._block = block
+        self._t, self._x, self._y, self._vx, self._vy = block.cols
+        self._flags = block.flags
+        self.n = 0
+
+    # start recording a new level run (flushes whatever the previous run left)
+    def begin(self, level_name):
+        self.flush()
+        self.run += 1
+        folder = os.path.join(self.out_dir, level_name)
+        os.makedirs(folder, exist_ok=True)
+        self.path = os.path.join(folder, self.session + FILE_EXT)
+
+    # hot path: called once per frame from Game.run — only stores numbers into preallocated slots
+    # (called before kill_and_respawn, so a death frame keeps the position where the player died)
+    def record(self, t, player):
+        i = self.n
+        self._t[i] = t
+        self._x[i] = player.pos.x
+        self._y[i] = player.pos.y
+        self._vx[i] = player.vel.x
+        self._vy[i] = player.vel.y
+        self._flags[i] = player_flags(player)
+        self.n = i + 1
+        if self.n == self.chunk_frames:
+            self.flush()
+
+    # hand the filled block to the writer thread and continue with a free one
+    def flush(self):
+        if self.n == 0 or self.path is None:
+            self.n = 0
+            return
+        self._jobs.put((self.path, self.run, self._block, self.n))
+        try:
+            block = self._free.get_nowait()
+        except queue.Empty:
+            block = _Block(self.chunk_frames)
+        self._use_block(block)
+
+    def close(self):
+        self.flush()
+        self._jobs.put(None)
+        self._thread.join()
+
+    def _writer(self):
+        while True:
+            job = self._jobs.get()
+            if job is None:
+                return
+            path, run, block, n = job
+            try:
+                with open(path, "ab") as f:
+                    f.write(HEADER.pack(MAGIC, run, n))
+                    for col in block.cols:
+                        if sys.byteorder == "big":
+                            col = col[:n]   # copy, so the reused block keeps native floats
+                            col.byteswap()
+                        f.write(memoryview(col)[:n].cast("B"))
+                    f.write(memoryview(block.flags)[:n])
+                    f.write(bytes((-n) % 4))  # header and float columns are 4-byte sized, only flags need padding
+            except Exception:
+                pass
+            self._free.put(block)
+
+# ------------------------------Aggregator------------------------------
+
+# "numpy" is only needed for the offline aggregator, not for playing
+def _numpy():
+    try:
+        import numpy as np
+    except ImportError:
+        raise SystemExit("The telemetry aggregator needs numpy: pip install numpy")
+    return np
+
+# read one session file and return its columns as numpy arrays
+# "run" column = run id of every frame, to split the file back into single attempts
+# ".fromfile" reads the whole file into memory and closes it, so the aggregator can hold
+# a batch of thousands of sessions without keeping a file handle (or memory map) open for each
+def read_session(path):
+    np = _numpy()
+    data = np.fromfile(path, dtype=np.uint8)
+    if len(data) == 0:
+        return None
+    parts = {name: [] for name in FLOAT_COLUMNS + ("flags",)}
+    runs, counts = [], []
+    off = 0
+    while off + HEADER.size <= len(data):
+        magic, run, n = HEADER.unpack_from(data, off)
+        if magic != MAGIC or off + chunk_size(n) > len(data):
+            break  # truncated tail (e.g. game killed mid-write)
+        pos = off + HEADER.size
+        for name in FLOAT_COLUMNS:
+            parts[name].append(np.frombuffer(data, dtype="<f4", count=n, offset=pos))
+            pos += 4 * n
+        parts["flags"].append(np.frombuffer(data, dtype=np.uint8, count=n, offset=pos))
+        runs.append(run)
+        counts.append(n)
+        off += chunk_size(n)
+    if not parts["flags"]:
+        return None
+    cols = {name: cols[0] if len(cols) == 1 else np.concatenate(cols) for name, cols in parts.items()}
+    cols["run"] = np.repeat(np.array(runs, dtype=np.uint32), counts)
+    return cols
+
+# per-tile counts for one level: "deaths" = death frames per tile, "traversal" = frames spent per tile
+# (x, y) is the player's top-left corner, so "center" offsets it to the middle of the player rect
+# files are read in batches and every batch is binned with one clip / floor / bincount pass
+def aggregate_level(paths, w, h, tile, center, batch=BATCH_FILES):
+    np = _numpy()
+    deaths = np.zeros(w * h, dtype=np.int64)
+    traversal = np.zeros(w * h, dtype=np.int64)
+    sessions = runs = 0
+    for start in range(0, len(paths), batch):
+        xs, ys, flags = [], [], []
+        for path in paths[start:start + batch]:
+            cols = read_session(path)
+            if cols is None:
+                continue
+            sessions += 1
+            runs += int(np.count_nonzero(np.diff(cols["run"]))) + 1
+            xs.append(cols["x"])
+            ys.append(cols["y"])
+            flags.append(cols["flags"])
+        if not xs:
+            continue
+        # clip into the map so falls below the level count on the bottom row
+        tx = np.clip(np.floor_divide(np.concatenate(xs) + center[0], tile), 0, w - 1).astype(np.int64)
+        ty = np.clip(np.floor_divide(np.concatenate(ys) + center[1], tile), 0, h - 1).astype(np.int64)
+        idx = ty * w + tx
+        traversal += np.bincount(idx, minlength=w * h)
+        dead = (np.concatenate(flags) & FLAG_DEATH) != 0
+        deaths += np.bincount(idx[dead], minlength=w * h)
+    return {"sessions": sessions, "runs": runs, "deaths": deaths.reshape(h, w), "traversal": traversal.reshape(h, w)}
+
+def _ascii_heatmap(lines, counts):
+    shades = " .:-=+*%@"
+    top = counts.max()
+    out = []
+    for y, row in enumerate(lines):
+        cells = []
+        for x, ch in enumerate(row):
+            c = counts[y, x]
+            if ch == "#" or c == 0 or top == 0:
+                cells.append(ch if ch in "#^SEN" else " ")
+            else:
+                cells.append(shades[1 + int((len(shades) - 2) * c / top)])
+        out.append("".join(cells))
+    return "\n".join(out)
+
+def run():
+    # imported here so "game.main" can import this module without a cycle
+    from .main import TILE, LEVELS_DIR, TELEMETRY_DIR, Level, Player
+
+    parser = argparse.ArgumentParser(description="Aggregate Climb Beyond telemetry into per-tile heatmaps")
+    parser.add_argument("dir", nargs="?", default=TELEMETRY_DIR, help="telemetry folder (one subfolder per level)")
+    parser.add_argument("--npz", help="also save every heatmap into this .npz file")
+    parser.add_argument("--quiet", action="store_true", help="only print totals, no ASCII maps")
+    args = parser.parse_args()
+    np = _numpy()
+    size = Player((0, 0)).size
+    center = (size.x / 2, size.y / 2)
+
+    saved = {}
+    for level_path in sorted(glob.glob(os.path.join(LEVELS_DIR, "*.txt"))):
+        name = os.path.splitext(os.path.basename(level_path))[0]
+        paths = sorted(glob.glob(os.path.join(args.dir, name, "*" + FILE_EXT)))
+        if not paths:
+            continue
+        level = Level.from_file(level_path)
+        result = aggregate_level(paths, level.w, level.h, TILE, center)
+        saved[f"{name}_deaths"] = result["deaths"]
+        saved[f"{name}_traversal"] = result["traversal"]
+        print(f"{name}: {result['sessions']} sessions, {result['runs']} runs, {int(result['deaths'].sum())} deaths, "
+              f"{int(result['traversal'].sum())} frames")
+        if not args.quiet:
+            print("-- deaths --")
+            print(_ascii_heatmap(level.lines, result["deaths"]))
+            print("-- traversal --")
+            print(_ascii_heatmap(level.lines, result["traversal"]))
+
+    if not saved:
+        print(f"No telemetry found in '{args.dir}'", file=sys.stderr)
+    elif args.npz:
+        np.savez_compressed(args.npz, **saved)
+
+if __name__ == "__main__":
+    run()